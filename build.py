@@ -0,0 +1,56 @@
+"""Poetry build script: compiles retry_async/api.py with Cython when possible.
+
+The module is compiled as-is (Cython pure Python mode), so the same source stays
+importable when no compiled extension is available.
+"""
+import typing as T
+import warnings
+
+from setuptools.command.build_ext import build_ext
+
+ext_modules: T.List[T.Any]
+try:
+    from Cython.Build import cythonize
+
+    ext_modules = cythonize(
+        ["retry_async/api.py"],
+        build_dir="build",
+        compiler_directives={
+            "language_level": 3,
+            "boundscheck": False,
+            "wraparound": False,
+            "binding": True,
+            # annotations are for mypy and tries may legitimately be float("inf"),
+            # so C types only come from explicit declarations
+            "annotation_typing": False,
+            "infer_types": False,
+        },
+    )
+except ImportError:
+    ext_modules = []
+
+
+class OptionalBuildExt(build_ext):
+    """Falls back to the pure Python module if the extension fails to build."""
+
+    def run(self) -> None:
+        try:
+            super().run()
+        except Exception as e:
+            warnings.warn(f"{e}, falling back to the pure Python module")
+
+    def build_extension(self, ext: T.Any) -> None:
+        try:
+            super().build_extension(ext)
+        except Exception as e:
+            warnings.warn(f"{e}, falling back to the pure Python module")
+
+
+def build(setup_kwargs: T.Dict[str, T.Any]) -> None:
+    setup_kwargs.update(
+        {
+            "ext_modules": ext_modules,
+            "cmdclass": {"build_ext": OptionalBuildExt},
+            "zip_safe": False,
+        }
+    )
@@ -0,0 +1,4 @@
+# Augmenting declarations for the Cython build of api.py (see build.py).
+# Pure arithmetic helpers cannot raise, so they skip the error check after each call.
+
+cdef double _next_delay(double delay, double backoff, double jitter, double max_delay) noexcept nogil
@@ -1,114 +1,308 @@
 import typing as T
 import logging
+import math
 import random
 import time
 import asyncio
-from functools import partial
-from decorator import decorator
+import functools
+import itertools
 
 logging_logger = logging.getLogger(__name__)
 
 EXCEPTIONS = T.Union[T.Tuple[T.Type[Exception], ...], T.Type[Exception]]
 
+# float("inf") or a negative number means no limit
+TRIES = T.Union[int, float]
+
+JITTER = T.Union[float, T.Tuple[float, float]]
+
 P = T.ParamSpec("P")
 
+# above this many tries, delays are computed while retrying instead of up front
+_MAX_SCHEDULED_TRIES = 10_000
+
+# only ever unpacked with **, never mutated, so retry_call_* can share it
+_NO_KWARGS: T.Dict[str, T.Any] = {}
+
+# an infinite repeat has no state to advance, so every call can share the same iterator
+_NO_DELAYS = itertools.repeat(0)
+
+
+def _next_delay(delay: float, backoff: float, jitter: float, max_delay: float) -> float:
+    """
+    Returns the delay before the next attempt (compiled to a C function, see api.pxd).
+    max_delay is math.inf when there is no limit, so the signature stays all floats.
+    """
+    delay = delay * backoff + jitter
+    return delay if delay < max_delay else max_delay
+
+
+def _make_jitter_fn(jitter: T.Tuple[float, float]) -> T.Callable[[], float]:
+    """Returns a function drawing random jitter from the range tuple (min, max)."""
+    # same as random.uniform(*jitter), without the lookups and subtraction per call
+    lo, hi = jitter
+    span = hi - lo
+    _random = random.random
+    return lambda: lo + span * _random()
+
+
+def _has_no_delay(delay: float, jitter: JITTER) -> bool:
+    """Whether every delay between attempts is zero (backoff and max_delay are then no-ops)."""
+    return delay == 0 and jitter == 0
+
+
+def _delay_schedule(
+    tries: TRIES,
+    delay: float,
+    max_delay: T.Optional[float],
+    backoff: float,
+    jitter: JITTER,
+) -> T.Optional[T.Tuple[float, ...]]:
+    """
+    Precomputes the delays between attempts, so retrying only has to look them up.
+
+    :returns: the tries - 1 delays, or None if they are not known in advance
+              (random jitter, infinite or very large tries).
+    """
+    if isinstance(jitter, tuple) or not isinstance(tries, int):
+        return None
+    if not 0 < tries <= _MAX_SCHEDULED_TRIES:
+        return None
+
+    schedule = []
+    _delay = delay
+    _max_delay = math.inf if max_delay is None else max_delay
+    for _ in range(tries - 1):
+        schedule.append(_delay)
+        _delay = _next_delay(_delay, backoff, jitter, _max_delay)
+    return tuple(schedule)
+
+
+def _delays(
+    tries: TRIES,
+    delay: float,
+    max_delay: T.Optional[float],
+    backoff: float,
+    jitter: JITTER,
+) -> T.Iterator[float]:
+    """Yields the delay before each retry, computing it as it goes."""
+    # unbounded tries do not count retries at all
+    retries = (
+        itertools.repeat(None)
+        if tries < 0 or tries == math.inf
+        else itertools.repeat(None, int(tries) - 1)
+    )
+    # a fixed jitter goes straight to _next_delay(), only a range needs a function
+    jitter_fn: T.Optional[T.Callable[[], float]] = None
+    if isinstance(jitter, tuple):
+        jitter_fn, _jitter = _make_jitter_fn(jitter), 0.0
+    else:
+        _jitter = jitter
+    _delay = delay
+    _max_delay = math.inf if max_delay is None else max_delay
+    for _ in retries:
+        yield _delay
+        if jitter_fn is not None:
+            _jitter = jitter_fn()
+        _delay = _next_delay(_delay, backoff, _jitter, _max_delay)
+
+
+def _delays_until(delays: T.Iterator[float], deadline_ns: int) -> T.Iterator[float]:
+    """
+    Yields the delays, cut to the time left until deadline_ns (a time.monotonic_ns()
+    value), and stops once it is reached.
+    """
+    for _delay in delays:
+        remaining = (deadline_ns - time.monotonic_ns()) / 1e9
+        if remaining <= 0:
+            return
+        yield _delay if _delay < remaining else remaining
+
+
+def _no_delays(*_: T.Any) -> T.Iterator[float]:
+    """Returns the delays for retrying forever without delay."""
+    return _NO_DELAYS
+
+
+def _iter_delays(
+    tries: TRIES,
+    delay: float,
+    max_delay: T.Optional[float],
+    backoff: float,
+    jitter: JITTER,
+) -> T.Iterator[float]:
+    """Returns the delays between attempts when they were not precomputed."""
+    if _has_no_delay(delay, jitter):
+        if tries < 0 or tries == math.inf:
+            return _NO_DELAYS
+        return itertools.repeat(0, int(tries) - 1)
+    return _delays(tries, delay, max_delay, backoff, jitter)
+
+
+def _make_delays_fn(
+    tries: TRIES,
+    delay: float,
+    max_delay: T.Optional[float],
+    backoff: float,
+    jitter: JITTER,
+) -> T.Tuple[T.Optional[T.Callable[..., T.Iterator[float]]], T.Tuple[T.Any, ...]]:
+    """
+    Resolves the retry options into the delays_fn and delays_args of the internals,
+    precomputing bounded delays with _delay_schedule(). delays_fn(*delays_args) returns
+    an iterator over the delays between attempts, which stops when there is no retry
+    left. The internals only call it once the first attempt has failed, so calls that
+    succeed first time never build an iterator.
+
+    :returns: delays_fn and delays_args. delays_fn is None if tries is 0 and f must not
+              be called at all.
+    """
+    if not tries:
+        return None, ()
+
+    schedule = _delay_schedule(tries, delay, max_delay, backoff, jitter)
+    if schedule is not None:
+        return iter, (schedule,)
+
+    return _iter_delays, (tries, delay, max_delay, backoff, jitter)
+
+
+def _warning_fn(
+    logger: T.Optional[logging.Logger],
+) -> T.Optional[T.Callable[..., None]]:
+    """
+    Returns logger.warning, or None if there is no logger or WARNING is disabled.
+    Resolved on the first failed attempt, so that later ones neither check the level
+    again nor build the (error, delay) arguments when nothing would be logged.
+    """
+    if logger is not None and logger.isEnabledFor(logging.WARNING):
+        return logger.warning
+    return None
+
+
+def _start_retrying(
+    delays_fn: T.Callable[..., T.Iterator[float]],
+    delays_args: T.Sequence[T.Any],
+    max_total_delay: T.Optional[float],
+    start_ns: int,
+    logger: T.Optional[logging.Logger],
+) -> T.Tuple[T.Iterator[float], T.Optional[T.Callable[..., None]]]:
+    """
+    Builds what retrying needs once the first attempt has failed: the delays between
+    attempts, stopping max_total_delay seconds after start_ns, and the warning function.
+    """
+    delays = delays_fn(*delays_args)
+    if max_total_delay is not None:
+        delays = _delays_until(delays, start_ns + int(max_total_delay * 1e9))
+    return delays, _warning_fn(logger)
+
+
+def _retry_delay(
+    delays: T.Iterator[float],
+    log_warn: T.Optional[T.Callable[..., None]],
+    error: Exception,
+) -> T.Optional[float]:
+    """
+    Returns the delay before retrying after error, and logs it, or None if there is no
+    retry left.
+    """
+    _delay = next(delays, None)
+    if _delay is not None and log_warn is not None:
+        log_warn("%s, retrying in %s seconds...", error, _delay)
+    return _delay
+
 
 def __retry_internal_sync(
     f: T.Callable[P, T.Any],
+    args: T.Sequence[T.Any],
+    kwargs: T.Mapping[str, T.Any],
     exceptions: EXCEPTIONS = Exception,
-    tries: int = -1,
-    delay: float = 0,
-    max_delay: float = None,
-    backoff: float = 1,
-    jitter: float = 0,
-    logger: logging.Logger = logging_logger,
+    delays_fn: T.Optional[T.Callable[..., T.Iterator[float]]] = _no_delays,
+    delays_args: T.Sequence[T.Any] = (),
+    max_total_delay: T.Optional[float] = None,
+    logger: T.Optional[logging.Logger] = logging_logger,
 ) -> T.Any:
     """
     Executes a function and retries it if it failed.
 
     :param f: the function to execute.
+    :param args: the positional arguments of the function to execute.
+    :param kwargs: the named arguments of the function to execute.
     :param exceptions: an exception or a tuple of exceptions to catch. default: Exception.
-    :param tries: the maximum number of attempts. default: -1 (infinite).
-    :param delay: initial delay between attempts. default: 0.
-    :param max_delay: the maximum value of delay. default: None (no limit).
-    :param backoff: multiplier applied to delay between attempts. default: 1 (no backoff).
-    :param jitter: extra seconds added to delay between attempts. default: 0.
-                   fixed if a number, random if a range tuple (min, max)
+    :param delays_fn: delays_fn(*delays_args) returns the delays between attempts, see
+                      _make_delays_fn(). default: retry forever without delay.
+    :param delays_args: the arguments of delays_fn. default: ().
+    :param max_total_delay: the maximum number of seconds to keep retrying, counted from
+                            the first attempt. default: None (no limit).
     :param logger: logger.warning(fmt, error, delay) will be called on failed attempts.
                    default: retry.logging_logger. if None, logging is disabled.
     :returns: the result of the f function.
     """
-    _tries, _delay = tries, delay
-    while _tries:
+    if delays_fn is None:
+        return None
+
+    start_ns = 0 if max_total_delay is None else time.monotonic_ns()
+    delays = None
+    while True:
         try:
-            return f()
+            return f(*args, **kwargs)
         except exceptions as e:
-            _tries -= 1
-            if not _tries:
+            if delays is None:
+                delays, log_warn = _start_retrying(
+                    delays_fn, delays_args, max_total_delay, start_ns, logger
+                )
+            _delay = _retry_delay(delays, log_warn, e)
+            if _delay is None:
                 raise
 
-            if logger is not None:
-                logger.warning("%s, retrying in %s seconds...", e, _delay)
-
+        if _delay:
             time.sleep(_delay)
-            _delay *= backoff
-
-            if isinstance(jitter, tuple):
-                _delay += random.uniform(*jitter)
-            else:
-                _delay += jitter
-
-            if max_delay is not None:
-                _delay = min(_delay, max_delay)
 
 
 async def __retry_internal_async(
     f: T.Callable[P, T.Any],
+    args: T.Sequence[T.Any],
+    kwargs: T.Mapping[str, T.Any],
     exceptions: EXCEPTIONS = Exception,
-    tries: int = -1,
-    delay: float = 0,
-    max_delay: float = None,
-    backoff: float = 1,
-    jitter: float = 0,
-    logger: logging.Logger = logging_logger,
+    delays_fn: T.Optional[T.Callable[..., T.Iterator[float]]] = _no_delays,
+    delays_args: T.Sequence[T.Any] = (),
+    max_total_delay: T.Optional[float] = None,
+    logger: T.Optional[logging.Logger] = logging_logger,
 ) -> T.Any:
     """
     Executes a function and retries it if it failed.
 
     :param f: the function to execute.
+    :param args: the positional arguments of the function to execute.
+    :param kwargs: the named arguments of the function to execute.
     :param exceptions: an exception or a tuple of exceptions to catch. default: Exception.
-    :param tries: the maximum number of attempts. default: -1 (infinite).
-    :param delay: initial delay between attempts. default: 0.
-    :param max_delay: the maximum value of delay. default: None (no limit).
-    :param backoff: multiplier applied to delay between attempts. default: 1 (no backoff).
-    :param jitter: extra seconds added to delay between attempts. default: 0.
-                   fixed if a number, random if a range tuple (min, max)
+    :param delays_fn: delays_fn(*delays_args) returns the delays between attempts, see
+                      _make_delays_fn(). default: retry forever without delay.
+    :param delays_args: the arguments of delays_fn. default: ().
+    :param max_total_delay: the maximum number of seconds to keep retrying, counted from
+                            the first attempt. default: None (no limit).
     :param logger: logger.warning(fmt, error, delay) will be called on failed attempts.
                    default: retry.logging_logger. if None, logging is disabled.
     :returns: the result of the f function.
     """
-    _tries, _delay = tries, delay
-    while _tries:
+    if delays_fn is None:
+        return None
+
+    start_ns = 0 if max_total_delay is None else time.monotonic_ns()
+    delays = None
+    while True:
         try:
-            return await f()
+            return await f(*args, **kwargs)
         except exceptions as e:
-            _tries -= 1
-            if not _tries:
+            if delays is None:
+                delays, log_warn = _start_retrying(
+                    delays_fn, delays_args, max_total_delay, start_ns, logger
+                )
+            _delay = _retry_delay(delays, log_warn, e)
+            if _delay is None:
                 raise
 
-            if logger is not None:
-                logger.warning("%s, retrying in %s seconds...", e, _delay)
-
+        if _delay:
             await asyncio.sleep(_delay)
-            _delay *= backoff
-
-            if isinstance(jitter, tuple):
-                _delay += random.uniform(*jitter)
-            else:
-                _delay += jitter
-
-            if max_delay is not None:
-                _delay = min(_delay, max_delay)
 
 
 DecSpecs = T.ParamSpec("DecSpecs")
@@ -118,12 +312,13 @@ def retry(
     exceptions: EXCEPTIONS = Exception,
     *,
     is_async: bool,
-    tries: int = -1,
+    tries: TRIES = -1,
     delay: float = 0,
-    max_delay: float = None,
+    max_delay: T.Optional[float] = None,
     backoff: float = 1,
-    jitter: float = 0,
-    logger: logging.Logger = logging_logger,
+    jitter: JITTER = 0,
+    logger: T.Optional[logging.Logger] = logging_logger,
+    max_total_delay: T.Optional[float] = None,
 ) -> T.Callable[..., T.Any]:
     """Returns a retry decorator.
 
@@ -136,47 +331,54 @@ def retry(
                    fixed if a number, random if a range tuple (min, max)
     :param logger: logger.warning(fmt, error, delay) will be called on failed attempts.
                    default: retry.logging_logger. if None, logging is disabled.
+    :param max_total_delay: the maximum number of seconds to keep retrying, counted from
+                            the first attempt. default: None (no limit). float("inf")
+                            also means no limit.
     :returns: a retry decorator.
     """
+    # a tuple keeps the except clause on its fast path for every failed attempt
+    exceptions = exceptions if isinstance(exceptions, tuple) else (exceptions,)
+    # float("inf") means no limit, as it does for tries
+    if max_total_delay == math.inf:
+        max_total_delay = None
+    delays_fn, delays_args = _make_delays_fn(tries, delay, max_delay, backoff, jitter)
 
     if is_async:
 
-        @decorator
-        async def retry_decorator_async(
-            f: T.Callable[P, T.Any], *fargs: T.Any, **fkwargs: T.Any
-        ) -> T.Any:
-            args = fargs if fargs else list()
-            kwargs = fkwargs if fkwargs else dict()
-            return await __retry_internal_async(
-                partial(f, *args, **kwargs),
-                exceptions,
-                tries,
-                delay,
-                max_delay,
-                backoff,
-                jitter,
-                logger,
-            )
+        def retry_decorator_async(f: T.Callable[P, T.Any]) -> T.Callable[P, T.Any]:
+            @functools.wraps(f)
+            async def wrapper(*fargs: T.Any, **fkwargs: T.Any) -> T.Any:
+                return await __retry_internal_async(
+                    f,
+                    fargs,
+                    fkwargs,
+                    exceptions,
+                    delays_fn,
+                    delays_args,
+                    max_total_delay,
+                    logger,
+                )
+
+            return wrapper
 
         return retry_decorator_async
     else:
 
-        @decorator
-        def retry_decorator_sync(
-            f: T.Callable[P, T.Any], *fargs: T.Any, **fkwargs: T.Any
-        ) -> T.Any:
-            args = fargs if fargs else list()
-            kwargs = fkwargs if fkwargs else dict()
-            return __retry_internal_sync(
-                partial(f, *args, **kwargs),
-                exceptions,
-                tries,
-                delay,
-                max_delay,
-                backoff,
-                jitter,
-                logger,
-            )
+        def retry_decorator_sync(f: T.Callable[P, T.Any]) -> T.Callable[P, T.Any]:
+            @functools.wraps(f)
+            def wrapper(*fargs: T.Any, **fkwargs: T.Any) -> T.Any:
+                return __retry_internal_sync(
+                    f,
+                    fargs,
+                    fkwargs,
+                    exceptions,
+                    delays_fn,
+                    delays_args,
+                    max_total_delay,
+                    logger,
+                )
+
+            return wrapper
 
         return retry_decorator_sync
 
@@ -186,12 +388,13 @@ def retry_call_sync(
     fargs: T.Any = None,
     fkwargs: T.Any = None,
     exceptions: EXCEPTIONS = Exception,
-    tries: int = -1,
+    tries: TRIES = -1,
     delay: float = 0,
-    max_delay: float = None,
+    max_delay: T.Optional[float] = None,
     backoff: float = 1,
-    jitter: float = 0,
-    logger: logging.Logger = logging_logger,
+    jitter: JITTER = 0,
+    logger: T.Optional[logging.Logger] = logging_logger,
+    max_total_delay: T.Optional[float] = None,
 ) -> T.Any:
     """
     Calls a function and re-executes it if it failed.
@@ -208,18 +411,27 @@ def retry_call_sync(
                    fixed if a number, random if a range tuple (min, max)
     :param logger: logger.warning(fmt, error, delay) will be called on failed attempts.
                    default: retry.logging_logger. if None, logging is disabled.
+    :param max_total_delay: the maximum number of seconds to keep retrying, counted from
+                            the first attempt. default: None (no limit). float("inf")
+                            also means no limit.
     :returns: the result of the f function.
     """
-    args = fargs if fargs else list()
-    kwargs = fkwargs if fkwargs else dict()
+    exceptions = exceptions if isinstance(exceptions, tuple) else (exceptions,)
+    if max_total_delay == math.inf:
+        max_total_delay = None
+    args = fargs or ()
+    kwargs = fkwargs or _NO_KWARGS
+    # the options are only resolved by _iter_delays() once the first attempt fails
+    delays_fn = _iter_delays if tries else None
+    delays_args = (tries, delay, max_delay, backoff, jitter)
     return __retry_internal_sync(
-        partial(f, *args, **kwargs),
+        f,
+        args,
+        kwargs,
         exceptions,
-        tries,
-        delay,
-        max_delay,
-        backoff,
-        jitter,
+        delays_fn,
+        delays_args,
+        max_total_delay,
         logger,
     )
 
@@ -229,12 +441,13 @@ async def retry_call_async(
     fargs: T.Any = None,
     fkwargs: T.Any = None,
     exceptions: EXCEPTIONS = Exception,
-    tries: int = -1,
+    tries: TRIES = -1,
     delay: float = 0,
-    max_delay: float = None,
+    max_delay: T.Optional[float] = None,
     backoff: float = 1,
-    jitter: float = 0,
-    logger: logging.Logger = logging_logger,
+    jitter: JITTER = 0,
+    logger: T.Optional[logging.Logger] = logging_logger,
+    max_total_delay: T.Optional[float] = None,
 ) -> T.Any:
     """
     Calls a function and re-executes it if it failed.
@@ -251,17 +464,25 @@ async def retry_call_async(
                    fixed if a number, random if a range tuple (min, max)
     :param logger: logger.warning(fmt, error, delay) will be called on failed attempts.
                    default: retry.logging_logger. if None, logging is disabled.
+    :param max_total_delay: the maximum number of seconds to keep retrying, counted from
+                            the first attempt. default: None (no limit). float("inf")
+                            also means no limit.
     :returns: the result of the f function.
     """
-    args = fargs if fargs else list()
-    kwargs = fkwargs if fkwargs else dict()
+    exceptions = exceptions if isinstance(exceptions, tuple) else (exceptions,)
+    if max_total_delay == math.inf:
+        max_total_delay = None
+    args = fargs or ()
+    kwargs = fkwargs or _NO_KWARGS
+    delays_fn = _iter_delays if tries else None
+    delays_args = (tries, delay, max_delay, backoff, jitter)
     return await __retry_internal_async(
-        partial(f, *args, **kwargs),
+        f,
+        args,
+        kwargs,
         exceptions,
-        tries,
-        delay,
-        max_delay,
-        backoff,
-        jitter,
+        delays_fn,
+        delays_args,
+        max_total_delay,
         logger,
     )
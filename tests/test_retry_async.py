@@ -1,5 +1,7 @@
 from unittest.mock import create_autospec
 from unittest.mock import MagicMock, AsyncMock
+import asyncio
+import inspect
 import time
 
 import pytest
@@ -15,7 +17,7 @@ async def test_retry(monkeypatch):
     def mock_sleep(seconds):
         mock_sleep_time[0] += seconds
 
-    monkeypatch.setattr(time, "sleep", mock_sleep)
+    monkeypatch.setattr(asyncio, "sleep", AsyncMock(side_effect=mock_sleep))
 
     hit = [0]
 
@@ -73,7 +75,7 @@ async def test_max_delay(monkeypatch):
     def mock_sleep(seconds):
         mock_sleep_time[0] += seconds
 
-    monkeypatch.setattr(time, "sleep", mock_sleep)
+    monkeypatch.setattr(asyncio, "sleep", AsyncMock(side_effect=mock_sleep))
 
     hit = [0]
 
@@ -102,7 +104,7 @@ async def test_fixed_jitter(monkeypatch):
     def mock_sleep(seconds):
         mock_sleep_time[0] += seconds
 
-    monkeypatch.setattr(time, "sleep", mock_sleep)
+    monkeypatch.setattr(asyncio, "sleep", AsyncMock(side_effect=mock_sleep))
 
     hit = [0]
 
@@ -185,3 +187,59 @@ async def test_retry_call_with_kwargs():
 
     assert result == kwargs["value"]
     assert f_mock.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_wraps():
+    @retry(is_async=True, tries=1)
+    async def f(value=0):
+        """docstring"""
+        return value
+
+    assert f.__name__ == "f"
+    assert f.__doc__ == "docstring"
+    assert inspect.iscoroutinefunction(f)
+    assert await f(value=3) == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("tries", [-1, 10])
+async def test_max_total_delay(monkeypatch, tries):
+    now_ns = [0]
+
+    def mock_sleep(seconds):
+        now_ns[0] += int(seconds * 1e9)
+
+    monkeypatch.setattr(asyncio, "sleep", AsyncMock(side_effect=mock_sleep))
+    monkeypatch.setattr(time, "monotonic_ns", lambda: now_ns[0])
+
+    hit = [0]
+
+    @retry(is_async=True, tries=tries, delay=1, backoff=2, max_total_delay=10)
+    async def f():
+        hit[0] += 1
+        1 / 0
+
+    with pytest.raises(ZeroDivisionError):
+        await f()
+    # sleeps 1, 2, 4, then only the remaining 3 seconds instead of 8
+    assert hit[0] == 5
+    assert now_ns[0] == 10 * 10**9
+
+
+@pytest.mark.asyncio
+async def test_max_total_delay_inf():
+    hit = [0]
+
+    async def f():
+        hit[0] += 1
+        1 / 0
+
+    with pytest.raises(ZeroDivisionError) as exc_info:
+        await retry(is_async=True, tries=3, max_total_delay=float("inf"))(f)()
+    assert exc_info.value.__context__ is None
+    assert hit[0] == 3
+
+    with pytest.raises(ZeroDivisionError):
+        await retry_call_async(f, tries=3, max_total_delay=float("inf"))
+    assert hit[0] == 6
@@ -1,5 +1,6 @@
 from unittest.mock import create_autospec
 from unittest.mock import MagicMock
+import logging
 import time
 
 import pytest
@@ -176,3 +177,217 @@ def test_retry_call_with_kwargs():
 
     assert result == kwargs["value"]
     assert f_mock.call_count == 1
+
+
+def test_wraps():
+    @retry(is_async=False, tries=1)
+    def f(value=0):
+        """docstring"""
+        return value
+
+    assert f.__name__ == "f"
+    assert f.__doc__ == "docstring"
+    assert f(value=3) == 3
+
+
+def test_random_jitter(monkeypatch):
+    mock_sleeps = []
+
+    monkeypatch.setattr(time, "sleep", mock_sleeps.append)
+
+    tries = 5
+    jitter = (1, 2)
+
+    @retry(is_async=False, tries=tries, jitter=jitter)
+    def f():
+        1 / 0
+
+    with pytest.raises(ZeroDivisionError):
+        f()
+    # the first delay is 0, so it does not sleep
+    assert len(mock_sleeps) == tries - 2
+    delays = [0] + mock_sleeps
+    for prev, cur in zip(delays, delays[1:]):
+        assert jitter[0] <= cur - prev <= jitter[1]
+
+
+def test_no_delay_does_not_sleep(monkeypatch):
+    mock_sleep = MagicMock()
+    monkeypatch.setattr(time, "sleep", mock_sleep)
+
+    hit = [0]
+    tries = 5
+
+    def f():
+        hit[0] += 1
+        1 / 0
+
+    with pytest.raises(ZeroDivisionError):
+        retry(is_async=False, tries=tries, backoff=2, max_delay=1)(f)()
+    assert hit[0] == tries
+
+    with pytest.raises(ZeroDivisionError):
+        retry_call_sync(f, tries=tries, backoff=2, max_delay=1)
+    assert hit[0] == 2 * tries
+    mock_sleep.assert_not_called()
+
+
+def test_logger(monkeypatch):
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+
+    logger = MagicMock(spec=logging.Logger)
+    logger.isEnabledFor.return_value = True
+    tries = 3
+
+    @retry(is_async=False, tries=tries, delay=1, logger=logger)
+    def f():
+        1 / 0
+
+    with pytest.raises(ZeroDivisionError):
+        f()
+    assert logger.warning.call_count == tries - 1
+
+    logger.reset_mock()
+    logger.isEnabledFor.return_value = False
+    with pytest.raises(ZeroDivisionError):
+        f()
+    logger.warning.assert_not_called()
+
+
+@pytest.mark.parametrize("tries", [-1, 10])
+def test_max_total_delay(monkeypatch, tries):
+    now_ns = [0]
+
+    def mock_sleep(seconds):
+        now_ns[0] += int(seconds * 1e9)
+
+    monkeypatch.setattr(time, "sleep", mock_sleep)
+    monkeypatch.setattr(time, "monotonic_ns", lambda: now_ns[0])
+
+    hit = [0]
+
+    @retry(is_async=False, tries=tries, delay=1, backoff=2, max_total_delay=10)
+    def f():
+        hit[0] += 1
+        1 / 0
+
+    with pytest.raises(ZeroDivisionError):
+        f()
+    # sleeps 1, 2, 4, then only the remaining 3 seconds instead of 8
+    assert hit[0] == 5
+    assert now_ns[0] == 10 * 10**9
+
+
+def test_tries_zero():
+    f_mock = MagicMock(return_value=1)
+
+    assert retry(is_async=False, tries=0)(f_mock)() is None
+    assert retry_call_sync(f_mock, tries=0) is None
+    f_mock.assert_not_called()
+
+
+def test_tries_minus1_with_delay(monkeypatch):
+    mock_sleep = MagicMock()
+    monkeypatch.setattr(time, "sleep", mock_sleep)
+
+    hit = [0]
+    target = 10
+
+    @retry(is_async=False, tries=-1, delay=1, backoff=2, max_delay=4)
+    def f():
+        hit[0] += 1
+        if hit[0] == target:
+            return target
+        else:
+            raise ValueError
+
+    assert f() == target
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [1, 2] + [4] * 7
+
+
+def test_logger_disabled_does_not_format(monkeypatch):
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+
+    class ExpensiveError(Exception):
+        def __str__(self):
+            raise AssertionError("formatted although WARNING is disabled")
+
+    logger = logging.getLogger("retry_async.tests.disabled")
+    logger.setLevel(logging.ERROR)
+    warning = MagicMock(wraps=logger.warning)
+    monkeypatch.setattr(logger, "warning", warning)
+
+    @retry(is_async=False, tries=3, delay=1, logger=logger)
+    def f():
+        raise ExpensiveError
+
+    with pytest.raises(ExpensiveError):
+        f()
+    warning.assert_not_called()
+
+
+def test_exceptions_tuple():
+    side_effect = [ValueError, KeyError, 3]
+    f_mock = MagicMock(side_effect=side_effect)
+
+    assert retry_call_sync(f_mock, exceptions=(ValueError, KeyError), tries=3) == 3
+    assert f_mock.call_count == len(side_effect)
+
+    f_mock = MagicMock(side_effect=[TypeError, 3])
+    with pytest.raises(TypeError):
+        retry_call_sync(f_mock, exceptions=(ValueError, KeyError), tries=3)
+    assert f_mock.call_count == 1
+
+
+def test_logger_untouched_on_success():
+    logger = MagicMock(spec=logging.Logger)
+
+    @retry(is_async=False, tries=3, delay=1, logger=logger)
+    def f():
+        return 1
+
+    assert f() == 1
+    assert logger.mock_calls == []
+
+
+@pytest.mark.parametrize(
+    "kwargs, clock_reads",
+    [
+        (dict(tries=-1, delay=1), 0),
+        (dict(tries=3, delay=1, jitter=(0, 1)), 0),
+        (dict(tries=3, delay=1, max_total_delay=10), 1),
+    ],
+)
+def test_success_does_not_start_retrying(monkeypatch, kwargs, clock_reads):
+    mock_monotonic_ns = MagicMock(return_value=0)
+    monkeypatch.setattr(time, "monotonic_ns", mock_monotonic_ns)
+    mock_sleep = MagicMock()
+    monkeypatch.setattr(time, "sleep", mock_sleep)
+    logger = MagicMock(spec=logging.Logger)
+
+    def f():
+        return 1
+
+    assert retry(is_async=False, logger=logger, **kwargs)(f)() == 1
+    assert retry_call_sync(f, logger=logger, **kwargs) == 1
+    # only the start of max_total_delay is read, the deadline is never checked
+    assert mock_monotonic_ns.call_count == 2 * clock_reads
+    mock_sleep.assert_not_called()
+    assert logger.mock_calls == []
+
+
+def test_max_total_delay_inf():
+    hit = [0]
+
+    def f():
+        hit[0] += 1
+        1 / 0
+
+    with pytest.raises(ZeroDivisionError) as exc_info:
+        retry(is_async=False, tries=3, max_total_delay=float("inf"))(f)()
+    assert exc_info.value.__context__ is None
+    assert hit[0] == 3
+
+    with pytest.raises(ZeroDivisionError):
+        retry_call_sync(f, tries=3, max_total_delay=float("inf"))
+    assert hit[0] == 6